@@ -12,6 +12,7 @@ bl_info = {
 import bpy
 import logging
 import importlib
+import os
 import sys
 from pathlib import Path
 
@@ -24,52 +25,73 @@ if not logger.handlers:
 logger.setLevel(logging.DEBUG)
 
 def _report_popup(message, level={'INFO'}):
+    """Show a popup once register() has returned; no-op when running headless."""
+    if bpy.app.background:
+        return
+
     def draw(self, context):
         for line in message.splitlines():
             self.layout.label(text=line)
-    bpy.context.window_manager.popup_menu(draw, title="Grid Snap", icon='INFO')
+
+    def show():
+        bpy.context.window_manager.popup_menu(draw, title="Grid Snap", icon='INFO')
+        return None
+
+    bpy.app.timers.register(show, first_interval=0.0)
+
+# Modules shipped with the addon. Developers adding files can set GRIDSNAP_DEV=1
+# to discover them from disk instead.
+_ADDON_MODULES = ("operators",)
 
 def get_addon_modules():
+    if not os.environ.get("GRIDSNAP_DEV"):
+        return _ADDON_MODULES
     addon_dir = Path(__file__).parent
     module_files = [f.stem for f in addon_dir.glob("*.py") if f.stem != "__init__"]
-    logger.debug(f"Discovered modules: {module_files}")
+    logger.debug("Discovered modules: %s", module_files)
     return module_files
 
 classes = []
+_classes_reversed = ()
 _loaded_modules = []
 
 def register():
+    global _classes_reversed
     logger.info("Registering Grid Snap (package=%r, file=%r)", __package__, __file__)
 
     # 1) Import all modules once
     for module_name in get_addon_modules():
         full_module_name = f"{__package__}.{module_name}"
         if full_module_name not in sys.modules:
-            logger.debug(f"import {full_module_name}")
+            logger.debug("import %s", full_module_name)
             importlib.import_module(full_module_name)
-        _loaded_modules.append(full_module_name)
+        if full_module_name not in _loaded_modules:
+            _loaded_modules.append(full_module_name)
 
-    # 2) Reload them (hot reload)
-    for full_module_name in list(_loaded_modules):
-        logger.debug(f"reload {full_module_name}")
-        importlib.reload(sys.modules[full_module_name])
+    # 2) Reload them (hot reload, developers only: GRIDSNAP_DEV=1)
+    if os.environ.get("GRIDSNAP_DEV"):
+        for full_module_name in list(_loaded_modules):
+            logger.debug("reload %s", full_module_name)
+            importlib.reload(sys.modules[full_module_name])
 
     # 3) Collect classes
     classes.clear()
     for full_module_name in _loaded_modules:
         module = sys.modules.get(full_module_name)
         if not module:
-            logger.warning(f"Module missing after reload: {full_module_name}")
+            logger.warning("Module missing after reload: %s", full_module_name)
             continue
         if hasattr(module, 'classes'):
-            logger.debug(f"Collecting classes from {full_module_name}: {len(module.classes)} found")
+            logger.debug("Collecting classes from %s: %d found", full_module_name, len(module.classes))
             classes.extend(module.classes)
         else:
-            logger.debug(f"No `classes` attr in {full_module_name}")
+            logger.debug("No `classes` attr in %s", full_module_name)
 
-    # 4) Register classes
+    # 4) Register classes (reverse order prebuilt first so a partial failure
+    #    still lets unregister() clean up whatever did register)
+    _classes_reversed = tuple(reversed(classes))
     for cls in classes:
-        logger.debug(f"register_class({cls.__name__})")
+        logger.debug("register_class(%s)", cls.__name__)
         bpy.utils.register_class(cls)
 
     # 5) Register properties + deferred init
@@ -90,7 +112,9 @@ def register():
         _report_popup(f"Property registration failed:\n{ex}")
         raise
 
-    _report_popup("Grid Snap enabled.\nCheck the System Console for details.\nN-panel: Grid Snap.")
+    logger.info("Grid Snap enabled.")
+    if os.environ.get("GRIDSNAP_POPUP"):
+        _report_popup("Grid Snap enabled.\nCheck the System Console for details.\nN-panel: Grid Snap.")
 
 def unregister():
     logger.info("Unregistering Grid Snap")
@@ -102,9 +126,9 @@ def unregister():
     except Exception as ex:
         logger.warning("Property unregistration failed: %s", ex)
 
-    for cls in reversed(classes):
+    for cls in _classes_reversed:
         try:
-            logger.debug(f"unregister_class({cls.__name__})")
+            logger.debug("unregister_class(%s)", cls.__name__)
             bpy.utils.unregister_class(cls)
         except Exception:
             pass
@@ -1,4 +1,5 @@
 import bpy
+import bmesh
 import logging
 from bpy.props import (
     BoolProperty,
@@ -10,8 +11,9 @@ from bpy.types import (
     Panel,
     PropertyGroup,
 )
-from math import isfinite, pi
+from math import frexp, isfinite, pi, remainder as _rem
 from mathutils import Vector
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -35,16 +37,17 @@ class HGProps(PropertyGroup):
         name="Override G/R/S",
         description="Use Grid Snap versions of Move/Rotate/Scale when pressing G/R/S",
         default=True,
-        update=lambda self, ctx: _update_override_hotkeys(ctx),
+        update=lambda self, ctx: _update_override_hotkeys(),
     )
 
 # ============================================================
 # Helpers
 # ============================================================
 
-def _sync_viewport_grid(context):
+def _sync_viewport_grid(context, step=None):
     """Make the drawn 3D View grid match the step."""
-    step = context.scene.hg.grid_size
+    if step is None:
+        step = context.scene.hg.grid_size
     wm = bpy.context.window_manager
     for win in wm.windows:
         scr = win.screen
@@ -55,37 +58,48 @@ def _sync_viewport_grid(context):
                 if space.type != 'VIEW_3D':
                     continue
                 ov = space.overlay
-                ov.show_floor = True
+                # Only write on change: RNA setattrs trigger notifier/redraw work.
+                if not ov.show_floor:
+                    ov.show_floor = True
                 # Blender uses the overlay scale to define INCREMENT step.
-                ov.grid_scale = step
-                ov.grid_subdivisions = 8
+                if ov.grid_scale != step:
+                    ov.grid_scale = step
+                if ov.grid_subdivisions != 8:
+                    ov.grid_subdivisions = 8
     logger.info("[GridSnap] viewport grid synced: scale=%.6f", step)
 
-def _apply_tool_snap(context):
+_SNAP_ANGLE = 15.0 * pi / 180.0
+
+def _apply_tool_snap(context, ts=None, step=None):
     """
     Baseline: enable INCREMENT snapping and keep overlay in sync.
-    (We toggle Absolute per-invoke in _invoke_translate.)
+    (We toggle Absolute per-invoke in HG_OT_move.)
+    Hot callers pass `ts`/`step` they already resolved to skip the RNA lookups.
     """
-    scene = getattr(context, "scene", None)
-    if scene is None:
-        logger.debug("Skip _apply_tool_snap: no scene on context yet")
-        return
-
-    ts = getattr(scene, "tool_settings", None)
     if ts is None:
-        logger.debug("Skip _apply_tool_snap: no tool_settings yet")
-        return
-
-    ts.use_snap = True
-    ts.snap_elements = {'INCREMENT'}
-    if hasattr(ts, "snap_angle"):
-        ts.snap_angle = 15.0 * pi / 180.0
-
-    _sync_viewport_grid(context)
+        scene = getattr(context, "scene", None)
+        if scene is None:
+            logger.debug("Skip _apply_tool_snap: no scene on context yet")
+            return
+
+        ts = getattr(scene, "tool_settings", None)
+        if ts is None:
+            logger.debug("Skip _apply_tool_snap: no tool_settings yet")
+            return
+
+    # Only write on change: RNA setattrs trigger notifier/depsgraph work.
+    if not ts.use_snap:
+        ts.use_snap = True
+    if ts.snap_elements != {'INCREMENT'}:
+        ts.snap_elements = {'INCREMENT'}
+    # snap_angle is stored as float32, so compare with a tolerance.
+    if hasattr(ts, "snap_angle") and abs(ts.snap_angle - _SNAP_ANGLE) > 1e-6:
+        ts.snap_angle = _SNAP_ANGLE
+
+    _sync_viewport_grid(context, step)
     logger.info("[GridSnap] snap baseline applied")
 
-def _set_absolute_snap(context, enable: bool):
-    ts = getattr(getattr(context, "scene", None), "tool_settings", None)
+def _set_absolute_snap(ts, enable: bool):
     if ts and hasattr(ts, "use_snap_grid_absolute"):
         ts.use_snap_grid_absolute = bool(enable)
 
@@ -99,13 +113,45 @@ def _quantize_vector_world(vec, step):
                    _round_to_step(vec.y, step),
                    _round_to_step(vec.z, step)))
 
+# Vector kernels. Callers guarantee step > 0; non-finite inputs propagate
+# (inf/nan never compare <= eps, and rint leaves them unchanged).
+
+def _is_pow2(s):
+    """True if s is exactly 2**k (frexp mantissa 0.5), e.g. grid sizes from [ / ]."""
+    m, _e = frexp(s)
+    return m == 0.5
+
+def _quantize_batch(X, step):
+    """Round an array to the nearest multiple of step (ties to even, like round())."""
+    if _is_pow2(step):
+        # 1/step is exact for powers of two, so a multiply is as exact as the
+        # divide and a good deal cheaper. rint/scale run in place.
+        out = np.multiply(X, 1.0 / step)
+    else:
+        out = np.divide(X, step)
+    np.rint(out, out=out)
+    out *= step
+    return out
+
+def _remainder_batch(X, step):
+    """Elementwise absolute distance from the nearest k*step."""
+    return np.abs(X - _quantize_batch(X, step))
+
+def _quantize_local_coords(coords, matrix_world, step):
+    """
+    Snap an (N, 3) array of local-space coords to the world grid in one batch:
+    local -> world, round to step, world -> local.
+    """
+    m = np.array(matrix_world, dtype=np.float64)
+    inv = np.array(matrix_world.inverted(), dtype=np.float64)
+    w = _quantize_batch(coords @ m[:3, :3].T + m[:3, 3], step)
+    return w @ inv[:3, :3].T + inv[:3, 3]
+
 # ---------- on-grid detection (robust) ----------
 
 def _remainder_to_grid(x, step):
-    """Absolute distance from the nearest k*step."""
-    if step <= 0:
-        return 0.0
-    return abs(x - round(x / step) * step)
+    """Absolute distance from the nearest k*step (exact IEEE remainder)."""
+    return abs(_rem(x, step)) if step > 0 else 0.0
 
 def _vec_remainder_to_grid(v, step):
     return (
@@ -114,103 +160,115 @@ def _vec_remainder_to_grid(v, step):
         _remainder_to_grid(v.z, step),
     )
 
+# Coordinates come from single-precision Blender data (mesh verts, matrices),
+# so float noise grows with magnitude: scale the tolerance by |x| in float32
+# ULPs. The floor (step * 1e-6, the baseline's step-relative term) covers
+# coordinates near zero, where noise comes from the matrix mixing in other,
+# larger components rather than from |x| itself. The cap (step * 1e-3) keeps
+# far-from-origin coordinates from reading as on-grid when they are not.
+_ULP_SCALE = float(np.finfo(np.float32).eps) * 16.0
+_TOL_FLOOR = 1e-6
+_TOL_CAP = 1e-3
+
+def _grid_tolerance(mag, step):
+    """On-grid tolerance for an array of coordinate magnitudes `mag`."""
+    return np.clip(np.abs(mag) * _ULP_SCALE, step * _TOL_FLOOR, step * _TOL_CAP)
+
+def _is_on_grid(w, step):
+    """Scalar test for one world-space Vector; returns (on_grid, max remainder)."""
+    rx, ry, rz = _vec_remainder_to_grid(w, step)
+    mag = max(abs(w.x), abs(w.y), abs(w.z))
+    tol = min(max(step * _TOL_FLOOR, mag * _ULP_SCALE), step * _TOL_CAP)
+    return (rx <= tol and ry <= tol and rz <= tol), max(rx, ry, rz)
+
 def _selection_has_any_on_grid(context, step):
     """
-    True if ANY selected element lies on the world grid within an epsilon
-    that scales with the step. Also returns a max remainder for diagnostics.
+    True if ANY selected element lies on the world grid within a tolerance
+    that scales with the coordinate magnitude (see _grid_tolerance).
     OBJECT mode: check object origins.
     EDIT_MESH: check selected verts' world coordinates.
     """
     obj = context.active_object
     if not obj:
         return False
+    if step <= 0:
+        return True  # degenerate grid: everything is "on" it
 
-    eps = max(1e-5, step * 1e-6)  # tolerant to float noise, scales with step
     max_r = 0.0
     any_on = False
 
     if context.mode == 'OBJECT':
         sel = context.selected_objects or [obj]
-        for ob in sel:
-            w = ob.matrix_world.translation
-            rx, ry, rz = _vec_remainder_to_grid(w, step)
-            max_r = max(max_r, rx, ry, rz)
-            if rx <= eps and ry <= eps and rz <= eps:
-                any_on = True
-                break
-        logger.debug("[GridSnap] OBJECT any_on=%s, max remainder=%.8f (eps=%.8f)", any_on, max_r, eps)
+        if len(sel) < 8:
+            # Small selections: NumPy setup costs more than it saves.
+            for ob in sel:
+                on, r = _is_on_grid(ob.matrix_world.translation, step)
+                max_r = max(max_r, r)
+                if on:
+                    any_on = True
+                    break
+        else:
+            locs = np.fromiter(
+                (c for ob in sel for c in ob.matrix_world.translation),
+                dtype=np.float64, count=3 * len(sel),
+            ).reshape(-1, 3)
+            r = _remainder_batch(locs, step)
+            tol = _grid_tolerance(np.abs(locs).max(axis=1, keepdims=True), step)
+            max_r = float(r.max())
+            any_on = np.flatnonzero((r <= tol).all(axis=1)).size > 0
+        logger.debug("[GridSnap] OBJECT any_on=%s, max remainder=%.8f", any_on, max_r)
         return any_on
 
     if obj.type == 'MESH' and context.mode == 'EDIT_MESH':
-        import bmesh
         bm = bmesh.from_edit_mesh(obj.data)
         mat = obj.matrix_world
+
+        # O(1) probe: the active vertex is usually the one the user cares about.
+        act = bm.select_history.active
+        if isinstance(act, bmesh.types.BMVert) and act.select:
+            on, max_r = _is_on_grid(mat @ act.co, step)
+            if on:
+                logger.debug("[GridSnap] EDIT_MESH any_on=True (active vert)")
+                return True
+
+        # Scan the rest, stopping at the first on-grid vert.
         for v in bm.verts:
             if v.select:
-                w = mat @ v.co
-                rx, ry, rz = _vec_remainder_to_grid(w, step)
-                max_r = max(max_r, rx, ry, rz)
-                if rx <= eps and ry <= eps and rz <= eps:
+                on, r = _is_on_grid(mat @ v.co, step)
+                max_r = max(max_r, r)
+                if on:
                     any_on = True
                     break
-        logger.debug("[GridSnap] EDIT_MESH any_on=%s, max remainder=%.8f (eps=%.8f)", any_on, max_r, eps)
+        logger.debug("[GridSnap] EDIT_MESH any_on=%s, max remainder=%.8f", any_on, max_r)
         return any_on
 
     # Fallback: just check the active object's origin
-    w = obj.matrix_world.translation
-    rx, ry, rz = _vec_remainder_to_grid(w, step)
-    max_r = max(rx, ry, rz)
-    any_on = rx <= eps and ry <= eps and rz <= eps
-    logger.debug("[GridSnap] FALLBACK any_on=%s, max remainder=%.8f (eps=%.8f)", any_on, max_r, eps)
+    any_on, max_r = _is_on_grid(obj.matrix_world.translation, step)
+    logger.debug("[GridSnap] FALLBACK any_on=%s, max remainder=%.8f", any_on, max_r)
     return any_on
 
 # ============================================================
 # Transform invokers
 # ============================================================
 
-def _invoke_translate(context):
-    """
-    If ANY selected element is on-grid:
-        - turn OFF Absolute (pure relative increments) so on-grid verts stay locked.
-    Else:
-        - turn ON Absolute to correct onto the grid at the start.
-    """
-    step = context.scene.hg.grid_size
-    has_on_grid = _selection_has_any_on_grid(context, step)
-
-    # Toggle absolute BEFORE invoking translate.
-    _set_absolute_snap(context, enable=not has_on_grid)
-    logger.debug("[GridSnap] Translate: has_on_grid=%s -> use_abs=%s",
-                 has_on_grid, not has_on_grid)
-
-    op = bpy.ops.transform.translate
-    kw = dict(
-        snap=True,
-        use_proportional_edit=False,
-        snap_elements={'INCREMENT'},
-        snap_target='CLOSEST',
-    )
-    return op('INVOKE_DEFAULT', **kw)
-
-def _invoke_rotate(context):
-    op = bpy.ops.transform.rotate
-    kw = dict(
-        snap=True,
-        use_proportional_edit=False,
-        snap_elements={'INCREMENT'},
-        snap_target='CLOSEST',
-    )
-    return op('INVOKE_DEFAULT', **kw)
-
-def _invoke_scale(context):
-    op = bpy.ops.transform.resize
-    kw = dict(
-        snap=True,
-        use_proportional_edit=False,
-        snap_elements={'INCREMENT'},
-        snap_target='CLOSEST',
-    )
-    return op('INVOKE_DEFAULT', **kw)
+# Shared transform kwargs. bpy.ops only reads these to fill operator
+# properties (never mutates them), so one module-level dict is safe to reuse.
+_TX_KW = {
+    'snap': True,
+    'use_proportional_edit': False,
+    'snap_elements': {'INCREMENT'},
+    'snap_target': 'CLOSEST',
+}
+
+_TX_OPS = {
+    'T': bpy.ops.transform.translate,
+    'R': bpy.ops.transform.rotate,
+    'S': bpy.ops.transform.resize,
+}
+
+def _invoke_tx(kind):
+    """Invoke the grid-snapped transform for kind 'T' (move), 'R' (rotate) or 'S' (scale)."""
+    return _TX_OPS[kind]('INVOKE_DEFAULT', **_TX_KW)
 
 # ============================================================
 # Operators (G/R/S wrappers)
@@ -222,11 +280,22 @@ class HG_OT_move(Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def invoke(self, context, event):
-        hg = context.scene.hg
+        scene = context.scene
+        hg = scene.hg
         if not hg.enabled:
             return bpy.ops.transform.translate('INVOKE_DEFAULT')
-        _apply_tool_snap(context)
-        return _invoke_translate(context)
+        ts = scene.tool_settings
+        step = hg.grid_size
+        _apply_tool_snap(context, ts, step)
+
+        # If ANY selected element is on-grid, turn OFF Absolute (pure relative
+        # increments) so on-grid verts stay locked; otherwise turn it ON to
+        # correct onto the grid at the start. Must happen BEFORE translate.
+        has_on_grid = _selection_has_any_on_grid(context, step)
+        _set_absolute_snap(ts, enable=not has_on_grid)
+        logger.debug("[GridSnap] Translate: has_on_grid=%s -> use_abs=%s",
+                     has_on_grid, not has_on_grid)
+        return _invoke_tx('T')
 
 class HG_OT_rotate(Operator):
     bl_idname = "hg.rotate"
@@ -234,11 +303,12 @@ class HG_OT_rotate(Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def invoke(self, context, event):
-        hg = context.scene.hg
+        scene = context.scene
+        hg = scene.hg
         if not hg.enabled:
             return bpy.ops.transform.rotate('INVOKE_DEFAULT')
-        _apply_tool_snap(context)
-        return _invoke_rotate(context)
+        _apply_tool_snap(context, scene.tool_settings, hg.grid_size)
+        return _invoke_tx('R')
 
 class HG_OT_scale(Operator):
     bl_idname = "hg.scale"
@@ -246,11 +316,12 @@ class HG_OT_scale(Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def invoke(self, context, event):
-        hg = context.scene.hg
+        scene = context.scene
+        hg = scene.hg
         if not hg.enabled:
             return bpy.ops.transform.resize('INVOKE_DEFAULT')
-        _apply_tool_snap(context)
-        return _invoke_scale(context)
+        _apply_tool_snap(context, scene.tool_settings, hg.grid_size)
+        return _invoke_tx('S')
 
 # ============================================================
 # Quantize (object & mesh edit)
@@ -264,23 +335,55 @@ class HG_OT_quantize_to_grid(Operator):
     def execute(self, context):
         step = context.scene.hg.grid_size
         obj = context.active_object
-        if not obj:
+        if not obj or step <= 0:
             return {'CANCELLED'}
 
         if context.mode == 'OBJECT':
-            for ob in context.selected_objects:
-                ob.location = _quantize_vector_world(ob.location, step)
+            sel = context.selected_objects
+            if len(sel) < 32:
+                for ob in sel:
+                    ob.location = _quantize_vector_world(ob.location, step)
+                return {'FINISHED'}
+            # Object.location has no foreach_set, but the rounding can be batched.
+            locs = _quantize_batch(np.array([ob.location[:] for ob in sel], dtype=np.float64), step)
+            for ob, row in zip(sel, locs.tolist()):
+                ob.location = row
             return {'FINISHED'}
 
         if obj.type == 'MESH' and context.mode == 'EDIT_MESH':
-            import bmesh
             bm = bmesh.from_edit_mesh(obj.data)
-            mat = obj.matrix_world
-            inv = mat.inverted()
-            for v in bm.verts:
-                if v.select:
-                    world = mat @ v.co
-                    v.co = inv @ _quantize_vector_world(world, step)
+
+            # Everything selected: round-trip through object mode so the whole
+            # buffer moves via foreach_get/foreach_set instead of per-BMVert.
+            # Not with shape keys (re-entering edit mode reloads coords from the
+            # active key block) or multi-object edit (mode_set toggles them all).
+            if (len(bm.verts)
+                    and obj.data.total_vert_sel == len(bm.verts)
+                    and not obj.data.shape_keys
+                    and len(context.objects_in_mode) == 1):
+                bpy.ops.object.mode_set(mode='OBJECT')
+                try:
+                    me = obj.data
+                    n = len(me.vertices)
+                    buf = np.empty(n * 3, dtype=np.float64)
+                    me.vertices.foreach_get("co", buf)
+                    buf = _quantize_local_coords(buf.reshape(n, 3), obj.matrix_world, step)
+                    me.vertices.foreach_set("co", buf.ravel())
+                    me.update()
+                finally:
+                    bpy.ops.object.mode_set(mode='EDIT')
+                return {'FINISHED'}
+
+            # Partial selection (or fast path unsafe): gather/scatter through the BMesh.
+            sel = [v for v in bm.verts if v.select]
+            if not sel:
+                return {'FINISHED'}
+            coords = np.empty((len(sel), 3), dtype=np.float64)
+            for i, v in enumerate(sel):
+                coords[i] = v.co[:]
+            local = _quantize_local_coords(coords, obj.matrix_world, step)
+            for i, v in enumerate(sel):
+                v.co = local[i]
             bmesh.update_edit_mesh(obj.data, loop_triangles=False, destructive=False)
             return {'FINISHED'}
 
@@ -298,8 +401,7 @@ class HG_OT_grid_step_down(Operator):
     def execute(self, context):
         hg = context.scene.hg
         hg.grid_size = max(1e-6, hg.grid_size * 0.5)
-        _sync_viewport_grid(context)
-        _apply_tool_snap(context)
+        _apply_tool_snap(context, context.scene.tool_settings, hg.grid_size)
         self.report({'INFO'}, f"Grid {hg.grid_size:g}")
         return {'FINISHED'}
 
@@ -311,8 +413,7 @@ class HG_OT_grid_step_up(Operator):
     def execute(self, context):
         hg = context.scene.hg
         hg.grid_size = min(1e6, hg.grid_size * 2.0)
-        _sync_viewport_grid(context)
-        _apply_tool_snap(context)
+        _apply_tool_snap(context, context.scene.tool_settings, hg.grid_size)
         self.report({'INFO'}, f"Grid {hg.grid_size:g}")
         return {'FINISHED'}
 
@@ -392,12 +493,28 @@ def _unregister_keymap():
         except Exception:
             pass
 
-def _update_override_hotkeys(context):
+_pending_keymap_sync = False
+
+def _apply_keymap_change():
+    """Timer: rebuild the keymap once for however many toggles happened."""
+    global _pending_keymap_sync
+    _pending_keymap_sync = False
     _unregister_keymap()
-    scene = getattr(context, "scene", None)
+    scene = getattr(bpy.context, "scene", None)
     if scene and getattr(scene, "hg", None):
         if scene.hg.override_hotkeys:
             _register_keymap()
+    return None
+
+def _update_override_hotkeys():
+    # Debounce: rapid toggles (drivers, scripts, reset-to-defaults) collapse
+    # into a single teardown/rebuild on the next timer tick.
+    global _pending_keymap_sync
+    if _pending_keymap_sync:
+        return
+    _pending_keymap_sync = True
+    # persistent: a file load must not drop the timer and strand the flag.
+    bpy.app.timers.register(_apply_keymap_change, first_interval=0.0, persistent=True)
 
 # ============================================================
 # Registration
@@ -413,6 +530,10 @@ def register_properties():
         _register_keymap()
 
 def unregister_properties():
+    global _pending_keymap_sync
+    if bpy.app.timers.is_registered(_apply_keymap_change):
+        bpy.app.timers.unregister(_apply_keymap_change)
+    _pending_keymap_sync = False
     bpy.types.VIEW3D_MT_object.remove(_menu_object)
     bpy.types.VIEW3D_MT_edit_mesh.remove(_menu_mesh)
     _unregister_keymap()
@@ -425,7 +546,6 @@ def init_after_register_async():
             ctx = bpy.context
             if not getattr(ctx, "scene", None):
                 return 0.2
-            _sync_viewport_grid(ctx)
             _apply_tool_snap(ctx)
         except Exception as ex:
             logger.debug("Initial grid sync deferred: %s", ex)